@@ -0,0 +1,22 @@
+"""
+Numba JIT for the numeric kernels in app.tools.
+
+numba is a required dependency (requirements.txt). If it cannot be imported,
+`njit` degrades to a no-op decorator and the kernels run as plain Python with
+identical results; that path is for debugging and for checking the kernels
+against their compiled versions, not a supported deployment.
+"""
+from __future__ import annotations
+
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        # Support both `@njit` and `@njit(cache=True, ...)`
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
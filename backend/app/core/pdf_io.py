@@ -0,0 +1,41 @@
+"""
+Process-local cache of opened PDF documents (PyMuPDF).
+
+Opening a PDF parses its xref table, which costs O(file size) and dominates
+short page extractions. Documents are memoized by (path, mtime, size), so an
+edited file is reopened. Cached documents are shared: callers must not close them.
+"""
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=16)
+def _open(path: str, mtime_ns: int, size: int):
+    import pymupdf  # only needed by the PDF tooling
+
+    return pymupdf.open(path)
+
+
+def open_cached(path: str):
+    st = os.stat(path)
+    return _open(os.fspath(path), st.st_mtime_ns, st.st_size)
+
+
+def page_text(doc, index: int, fast: bool = False) -> str:
+    """
+    Plain text of one page. fast=True keeps only whitespace preservation and
+    dehyphenation (no ligature / mediabox-clip passes), unsorted.
+    """
+    page = doc.load_page(index)
+    if not fast:
+        return page.get_text("text")
+    import pymupdf
+
+    return page.get_text("text", sort=False, flags=pymupdf.TEXT_PRESERVE_WHITESPACE | pymupdf.TEXT_DEHYPHENATE)
+
+
+def clear_cache() -> None:
+    """Drop cached documents, e.g. in a forked worker so it does not share the parent's file offset."""
+    _open.cache_clear()
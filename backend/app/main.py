@@ -11,7 +11,7 @@ from app.core.config import settings
 from app.core.logger import setup_logging
 from app.db.base import get_db, init_db
 from app.db.models import Heat, AdviceLog
-from app.schemas import ChatRequest, ChatResponse, SaveHeatResultsInputs
+from app.schemas import ChatRequest, ChatResponse, HeatConfirmResponse, SaveHeatResultsInputs
 
 from app.mcp.data_server import build_data_router
 from app.data.simulator import DataSimulator
@@ -351,7 +351,7 @@ async def get_heats(
         for heat, advice in rows
     ]
 
-@app.post("/api/heat/confirm")
+@app.post("/api/heat/confirm", response_model=HeatConfirmResponse)
 async def confirm_heat(
     data: SaveHeatResultsInputs,
     session: AsyncSession = Depends(get_db)
@@ -373,11 +373,11 @@ async def confirm_heat(
         await session.commit()
         await session.refresh(new_heat)
         
-        return {
-            "status": "success",
-            "heat_id": new_heat.heat_id,
-            "learned_entries": 1 # Mock value
-        }
+        return HeatConfirmResponse(
+            status="success",
+            heat_id=new_heat.heat_id,
+            learned_entries=1, # Mock value
+        )
     except Exception as e:
         logger.error(f"Error saving heat: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class UnitValue(BaseModel):
@@ -52,10 +52,13 @@ class CoolantType(str, Enum):
 
 
 class CoolantRecommendation(BaseModel):
+    # Frozen with tuple notes: calculate_thermal_balance returns cached, shared instances
+    model_config = ConfigDict(frozen=True)
+
     coolant_type: CoolantType
     kg_per_t: float = Field(..., ge=0)
     add_within_minutes: float = Field(default=2.5, ge=0)
-    notes: list[str] = Field(default_factory=list)
+    notes: tuple[str, ...] = ()
 
 
 class LanceMode(str, Enum):
@@ -64,14 +67,19 @@ class LanceMode(str, Enum):
 
 
 class LanceStep(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     start_min: float = Field(..., ge=0)
     end_min: float = Field(..., ge=0)
     lance_height_mm: int = Field(..., ge=0)
 
 
 class LanceProfile(BaseModel):
+    # Frozen: recommend_lance_profile returns prebuilt, shared instances
+    model_config = ConfigDict(frozen=True)
+
     mode: LanceMode
-    steps: list[LanceStep]
+    steps: tuple[LanceStep, ...]
     endgame_action: str
 
 
@@ -83,11 +91,14 @@ class CriticalTempResult(BaseModel):
 
 
 class DiagnoseFinding(BaseModel):
+    # Frozen with tuple fields: hashable (set-dedupable) and safe to share as a constant
+    model_config = ConfigDict(frozen=True)
+
     title: str
     severity: Literal["high", "medium", "low"]
     root_cause: str = Field(..., description="化学反应机理或热力学原因分析")
-    evidence: list[str] = Field(default_factory=list)
-    recommendation: list[str] = Field(default_factory=list)
+    evidence: tuple[str, ...] = ()
+    recommendation: tuple[str, ...] = ()
 
 
 class DiagnoseLowYieldResult(BaseModel):
@@ -197,6 +208,12 @@ class SaveHeatResultsInputs(BaseModel):
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+class HeatConfirmResponse(BaseModel):
+    status: str
+    heat_id: str
+    learned_entries: int
+
+
 class CloudBrainState(BaseModel):
     current_step: str
     l1_result: InitialChargeResult | None = None
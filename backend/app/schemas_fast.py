@@ -0,0 +1,97 @@
+"""
+msgspec mirrors of the input schemas, for validation-heavy batch runs
+(parameter sweeps, bulk JSON decoding of heats).
+
+Same fields, defaults and numeric bounds as app.schemas; decoding with
+msgspec validates the constraints far cheaper than pydantic. Convert to the
+pydantic models with `to_pydantic` only at the boundary that needs them
+(tool calls, API responses).
+
+    batch = msgspec.json.decode(raw, type=list[SimulationInputsMS])
+    results = [simulate_blow_path(to_pydantic(ms)) for ms in batch]
+"""
+from __future__ import annotations
+
+from typing import Annotated, Any
+
+import msgspec
+from pydantic import BaseModel
+
+from .schemas import (
+    FurnaceLifeStage,
+    InitialChargeInputs,
+    IronInitialAnalysis,
+    ProcessData,
+    SimulationInputs,
+    SlagAnalysis,
+)
+
+NonNegative = Annotated[float, msgspec.Meta(ge=0)]
+
+
+class IronInitialAnalysisMS(msgspec.Struct, frozen=True, kw_only=True):
+    C: Annotated[float, msgspec.Meta(ge=0, le=10.0)]
+    Si: Annotated[float, msgspec.Meta(ge=0, le=5.0)]
+    V: Annotated[float, msgspec.Meta(ge=0, le=5.0)]
+    Ti: Annotated[float, msgspec.Meta(ge=0, le=5.0)]
+    P: Annotated[float, msgspec.Meta(ge=0, le=2.0)]
+    S: Annotated[float, msgspec.Meta(ge=0, le=2.0)]
+
+
+class SlagAnalysisMS(msgspec.Struct, frozen=True, kw_only=True):
+    V2O5: NonNegative | None = None
+    SiO2: NonNegative | None = None
+    TiO2: NonNegative | None = None
+    CaO: NonNegative | None = None
+    TFe: NonNegative | None = None
+
+
+class ProcessDataMS(msgspec.Struct, frozen=True, kw_only=True):
+    is_one_can: bool | None = None
+    tap_time_min: NonNegative | None = None
+    coolant_type_used: str | None = None
+    coolant_structure_notes: list[str] = []
+    events: list[dict[str, Any]] = []
+    lance_height_min: float | None = None
+    final_temp_c: float | None = None
+    oxygen_pressure_mpa: float | None = None
+
+
+class InitialChargeInputsMS(msgspec.Struct, frozen=True, kw_only=True):
+    iron_weight_t: Annotated[float, msgspec.Meta(ge=50.0, le=350.0)]
+    iron_temp_c: Annotated[float, msgspec.Meta(ge=1100.0, le=1600.0)]
+    iron_analysis: IronInitialAnalysisMS
+    is_one_can: bool = True
+    target_temp_c: Annotated[float, msgspec.Meta(ge=1250.0, le=1600.0)] = 1360.0
+    ladle_transport_time_min: NonNegative = 15.0
+    ladle_empty_time_min: NonNegative = 30.0
+    prev_lining_heat: float | None = None
+    prev_slag_status: dict[str, float] | None = None
+
+
+class SimulationInputsMS(msgspec.Struct, frozen=True, kw_only=True):
+    initial_temp_c: Annotated[float, msgspec.Meta(ge=1100.0, le=1600.0)]
+    initial_analysis: IronInitialAnalysisMS
+    recipe: dict[str, float]
+    oxygen_flow_rate_m3h: Annotated[float, msgspec.Meta(ge=1000.0, le=60000.0)] = 22000.0
+    duration_s: Annotated[int, msgspec.Meta(ge=60, le=3600)] = 360
+    furnace_life_stage: FurnaceLifeStage = FurnaceLifeStage.MIDDLE
+    off_gas_correction: bool = False
+
+
+_PYDANTIC: dict[type[msgspec.Struct], type[BaseModel]] = {
+    IronInitialAnalysisMS: IronInitialAnalysis,
+    SlagAnalysisMS: SlagAnalysis,
+    ProcessDataMS: ProcessData,
+    InitialChargeInputsMS: InitialChargeInputs,
+    SimulationInputsMS: SimulationInputs,
+}
+
+
+def to_pydantic(ms: msgspec.Struct) -> BaseModel:
+    """
+    Convert a mirror struct to its app.schemas model.
+    Validated construction on purpose: on pydantic-core it is cheaper than
+    model_construct for these flat models, and keeps the pydantic invariants.
+    """
+    return _PYDANTIC[type(ms)].model_validate(msgspec.to_builtins(ms))
@@ -1,5 +1,8 @@
 from __future__ import annotations
 from typing import Dict, Any
+
+import numpy as np
+
 from app.schemas import SimulationInputs
 
 # Danieli SDM Constants (Consistent with thermal_balance.py)
@@ -31,6 +34,17 @@ M_V = 50.94
 M_TI = 47.87
 M_O = 16.00
 
+# Per-species tables in oxidation order (Si > Ti > V > C > Fe), read-only
+_SI, _TI, _V, _C, _FE = range(5)
+_M = np.array([M_SI, M_TI, M_V, M_C, M_FE], dtype=np.float64)
+_M.setflags(write=False)
+# C reaction heat assumes 90% CO / 10% CO2
+_H_R = np.array([H_R_SI, H_R_TI, H_R_V, H_R_C_CO * 0.9 + H_R_C_CO2 * 0.1, H_R_FE], dtype=np.float64)
+_H_R.setflags(write=False)
+# mol O2 consumed per mol of element (C: 90% CO / 10% CO2)
+_O2_PER_MOL = np.array([1.0, 1.0, 0.75, 0.55, 0.5], dtype=np.float64)
+_O2_PER_MOL.setflags(write=False)
+
 def calculate_equilibrium_state(inp: SimulationInputs) -> Dict[str, Any]:
     """
     Danieli SDM Equilibrium Model (Four Balances Implementation)
@@ -93,57 +107,31 @@ def calculate_equilibrium_state(inp: SimulationInputs) -> Dict[str, Any]:
     # Danieli Model uses specific coefficients (SoxE).
     # We will simulate consumption based on stoichiometry.
     
+    # Stoichiometry (mol O2 per mol element), see _O2_PER_MOL:
     # 2.1 Si + O2 -> SiO2
-    mols_si = (m_si_init * 1000) / M_SI # g -> mol
-    o2_req_si = mols_si # 1:1 ratio
-    
-    react_si_mols = min(mols_si, total_o2_mols)
-    total_o2_mols -= react_si_mols
-    m_si_final = 0.0 if react_si_mols == mols_si else (mols_si - react_si_mols) * M_SI / 1000
-    
     # 2.2 Ti + O2 -> TiO2
-    mols_ti = (m_ti_init * 1000) / M_TI
-    o2_req_ti = mols_ti # 1:1
-    
-    react_ti_mols = 0.0
-    if total_o2_mols > 0:
-        react_ti_mols = min(mols_ti, total_o2_mols)
-        total_o2_mols -= react_ti_mols
-    m_ti_final = 0.0 if react_ti_mols == mols_ti else (mols_ti - react_ti_mols) * M_TI / 1000
-        
     # 2.3 4V + 3O2 -> 2V2O3 (or V2O5? Danieli mentions V recovery. Usually V -> V2O3 in converter)
-    # Let's assume V + 0.75 O2 -> 0.5 V2O3
-    mols_v = (m_v_init * 1000) / M_V
-    o2_req_v = mols_v * 0.75
-    
-    react_v_mols = 0.0
-    if total_o2_mols > 0:
-        max_v_react = total_o2_mols / 0.75
-        react_v_mols = min(mols_v, max_v_react)
-        total_o2_mols -= react_v_mols * 0.75
-    m_v_final = (mols_v - react_v_mols) * M_V / 1000
-        
-    # 2.4 2C + O2 -> 2CO (Partial oxidation primarily)
-    # Danieli mentions PCO2 factor. Let's assume 10% CO2, 90% CO.
-    # C + 0.5 O2 -> CO
-    # C + 1.0 O2 -> CO2
-    # Avg O2 per C = 0.9*0.5 + 0.1*1.0 = 0.45 + 0.1 = 0.55 mol O2 per mol C.
-    mols_c = (m_c_init * 1000) / M_C
-    o2_req_c = mols_c * 0.55
-    
-    react_c_mols = 0.0
-    if total_o2_mols > 0:
-        max_c_react = total_o2_mols / 0.55
-        react_c_mols = min(mols_c, max_c_react)
-        total_o2_mols -= react_c_mols * 0.55
-    m_c_final = (mols_c - react_c_mols) * M_C / 1000
+    #     i.e. V + 0.75 O2 -> 0.5 V2O3
+    # 2.4 C -> CO/CO2. Danieli mentions PCO2 factor. Let's assume 10% CO2, 90% CO.
+    #     Avg O2 per C = 0.9*0.5 + 0.1*1.0 = 0.55 mol O2 per mol C.
+    mols = np.array([m_si_init, m_ti_init, m_v_init, m_c_init]) * 1000 / _M[:_FE] # g -> mol
+    o2_demand = mols * _O2_PER_MOL[:_FE]
+    
+    # Species before k react fully, species k partially, the rest not at all.
+    cum_demand = np.cumsum(o2_demand)
+    k = int(np.searchsorted(cum_demand, total_o2_mols))
+    react_mols = mols.copy()
+    react_mols[k:] = 0.0
+    if k < _FE:
+        o2_left = total_o2_mols - (cum_demand[k - 1] if k else 0.0)
+        react_mols[k] = max(0.0, o2_left) / _O2_PER_MOL[k]
+    
+    react_si_mols, react_ti_mols, react_v_mols, react_c_mols = react_mols.tolist()
+    m_si_final, m_ti_final, m_v_final, m_c_final = ((mols - react_mols) * _M[:_FE] / 1000).tolist()
         
     # 2.5 Fe + 0.5 O2 -> FeO
     # Remaining oxygen oxidizes Fe
-    react_fe_mols = 0.0
-    if total_o2_mols > 0:
-        react_fe_mols = total_o2_mols / 0.5 # 1 mol O2 oxidizes 2 mol Fe
-        # Check if we have enough Fe? Usually yes.
+    react_fe_mols = max(0.0, total_o2_mols - cum_demand[-1]) / _O2_PER_MOL[_FE]
     
     # --- 3. Slag Balance ---
     # Calculate Oxides
@@ -169,28 +157,10 @@ def calculate_equilibrium_state(inp: SimulationInputs) -> Dict[str, Any]:
     H_input_hm = h_hm * iron_weight_t # MJ
     
     # Reaction Heats
-    H_gen_si = (react_si_mols * M_SI / 1000 / 1000) * H_R_SI * 1000 # mol -> ton -> MJ? 
-    # H_R_SI is MJ/t. react_si_mols * M_SI is grams. /1000 -> kg. /1000 -> ton.
-    # Let's simplify: Mass reacted (t) * H_R (MJ/t)
-    
-    w_si_reacted_t = (react_si_mols * M_SI) / 1e6
-    w_ti_reacted_t = (react_ti_mols * M_TI) / 1e6
-    w_v_reacted_t = (react_v_mols * M_V) / 1e6
-    w_c_reacted_t = (react_c_mols * M_C) / 1e6
-    w_fe_reacted_t = (react_fe_mols * M_FE) / 1e6
-    
-    H_gen_si = w_si_reacted_t * H_R_SI
-    H_gen_ti = w_ti_reacted_t * H_R_TI
-    H_gen_v = w_v_reacted_t * H_R_V
-    
-    # C -> CO/CO2
-    # 10% CO2
-    h_c_avg = H_R_C_CO * 0.9 + H_R_C_CO2 * 0.1
-    H_gen_c = w_c_reacted_t * h_c_avg
-    
-    H_gen_fe = w_fe_reacted_t * H_R_FE
+    # Mass reacted (t) * H_R (MJ/t). mol * g/mol = g; / 1e6 -> ton.
+    w_reacted_t = np.append(react_mols, react_fe_mols) * _M / 1e6
     
-    H_gen_total = H_gen_si + H_gen_ti + H_gen_v + H_gen_c + H_gen_fe
+    H_gen_total = float(w_reacted_t @ _H_R)
     
     # Heat Loss
     H_loss = 2000.0 # MJ Estimate
@@ -212,7 +182,7 @@ def calculate_equilibrium_state(inp: SimulationInputs) -> Dict[str, Any]:
     # But scrap needs to be heated to T_final.
     # So Scrap is part of W_steel.
     
-    w_steel_final_t = total_input_metal_t - (w_c_reacted_t + w_si_reacted_t + w_ti_reacted_t + w_v_reacted_t + w_fe_reacted_t)
+    w_steel_final_t = total_input_metal_t - float(w_reacted_t.sum())
     w_slag_final_t = total_slag_kg / 1000.0
     
     # H_avail = w_steel * (0.76 * T + 193) + w_slag * (1.19 * T)
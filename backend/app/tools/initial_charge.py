@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+from bisect import bisect_left
+
+import numpy as np
+
 from ..schemas import InitialChargeInputs, InitialChargeResult
-from ..core.config import settings
+
+# 1300度基准冷却剂表 (kg/t, 取中间值), 按 Si 上限分档 (区间右闭):
+# <=0.15: 22.5 (15-30), 0.15-0.20: 33.0 (30-36), 0.20-0.25: 39.0 (36-42), >0.25: 45.0 (42-48)
+_COOLANT_SI_BINS = (0.15, 0.20, 0.25)
+_BASE_COOLANT_KG_T = (22.5, 33.0, 39.0, 45.0)
 
 def calculate_initial_charge(inp: InitialChargeInputs) -> InitialChargeResult:
     """
@@ -34,17 +42,8 @@ def calculate_initial_charge(inp: InitialChargeInputs) -> InitialChargeResult:
         # Note: We modify local 'temp' variable used for coolant calculation, 
         # but not the original input record.
     
-    base_coolant_kg_t = 0.0
-    
     # 1300度基准表 (取中间值)
-    if si <= 0.15:
-        base_coolant_kg_t = 22.5 # 15-30
-    elif 0.15 < si <= 0.20:
-        base_coolant_kg_t = 33.0 # 30-36
-    elif 0.20 < si <= 0.25:
-        base_coolant_kg_t = 39.0 # 36-42
-    else: # > 0.25
-        base_coolant_kg_t = 45.0 # 42-48
+    base_coolant_kg_t = _BASE_COOLANT_KG_T[bisect_left(_COOLANT_SI_BINS, si)]
         
     # 温度修正 (基准 1300)
     temp_diff = temp - 1300.0
@@ -158,3 +157,93 @@ def calculate_initial_charge(inp: InitialChargeInputs) -> InitialChargeResult:
         v_si_ti_ratio=round(ratio, 3),
         warnings=warnings
     )
+
+
+def calculate_initial_charge_batch(inputs: list[InitialChargeInputs]) -> list[InitialChargeResult]:
+    """
+    批量版 calculate_initial_charge (What-If 扫描): 算术部分按列向量化，结果与逐个调用一致。
+    """
+    n = len(inputs)
+    if n == 0:
+        return []
+
+    def column(get) -> np.ndarray:
+        return np.fromiter((get(x) for x in inputs), dtype=np.float64, count=n)
+
+    weight = column(lambda x: x.iron_weight_t)
+    si = column(lambda x: x.iron_analysis.Si)
+    c = column(lambda x: x.iron_analysis.C)
+    v = column(lambda x: x.iron_analysis.V)
+    ti = column(lambda x: x.iron_analysis.Ti)
+    # Memory Correction: 1 unit of lining heat ~= 0.5 degree effective temp increase
+    temp = column(lambda x: x.iron_temp_c) + column(lambda x: x.prev_lining_heat or 0.0) * 0.5
+
+    # --- 冷却剂计算 (建龙查表法) ---
+    base_coolant_kg_t = np.asarray(_BASE_COOLANT_KG_T)[np.searchsorted(_COOLANT_SI_BINS, si, side="left")]
+    total_coolant_kg_t = np.clip(base_coolant_kg_t + (temp - 1300.0) * 0.18, 0.0, None)
+    remaining_t = (total_coolant_kg_t * weight) / 1000.0
+
+    # --- 冷却剂分配策略: 钒渣铁 > 氧化铁皮 > 球返/球团 ---
+    use_v_slag_iron = si >= 0.20
+    v_slag_iron_t = np.where(use_v_slag_iron, np.minimum(2.0, remaining_t * 0.5), 0.0)
+    remaining_t = remaining_t - v_slag_iron_t
+    use_scale = remaining_t > 0
+    scale_t = np.where(use_scale, np.minimum(0.5, remaining_t * 0.3), 0.0)
+    remaining_t = remaining_t - scale_t
+    pellets_t = np.clip(remaining_t, 0.0, None)
+
+    # --- 氧量计算 ---
+    delta_si = si / 100.0
+    delta_c = (c - 3.50) / 100.0
+    delta_v = (v - 0.05) / 100.0
+    delta_ti = ti / 100.0
+    oxy_demand = (
+        (delta_si * 0.8) +
+        (delta_c * 0.93) +
+        (delta_v * 0.35) +
+        (delta_ti * 0.5)
+    ) * weight * 1000
+    oxygen_total = oxy_demand / 0.9
+
+    # --- 渣量预测 ---
+    total_slag = (
+        (delta_si * weight * 1000) * 2.14
+        + (delta_v * weight * 1000) * 1.47
+        + (delta_ti * weight * 1000) * 1.67
+        + (pellets_t + v_slag_iron_t) * 1000 * 0.05
+    )
+    slag_t = (total_slag / 0.6) / 1000.0
+
+    si_ti_sum = si + ti
+    ratio = np.divide(v, si_ti_sum, out=np.full(n, 99.0), where=si_ti_sum > 0)
+
+    # 逐行组装结果: 先转成 Python 列表，避免逐元素取 NumPy 标量的开销
+    results = []
+    for v_slag, scale, pellets, oxy, slag, r, has_v_slag, has_scale in zip(
+        v_slag_iron_t.tolist(), scale_t.tolist(), pellets_t.tolist(),
+        oxygen_total.tolist(), slag_t.tolist(), ratio.tolist(),
+        use_v_slag_iron.tolist(), use_scale.tolist(),
+    ):
+        recipe = {}
+        warnings = []
+        if has_v_slag:
+            recipe["钒渣铁"] = round(v_slag, 2)
+            warnings.append("高硅铁水(>=0.20%): 已启用钒渣铁(废钢斗加入)。")
+        if has_scale:
+            recipe["氧化铁皮"] = round(scale, 2)
+        recipe["球返/球团"] = round(pellets, 2)
+        if pellets > 2.5:
+            warnings.append(f"警告: 球返加入量 ({pellets:.2f}t) 超过 2.5t 限制，建议检查铁水温度或增加废钢/生铁。")
+        if r < 1.0:
+            warnings.append("V/(Si+Ti) < 1.0: 渣品位可能不达标。")
+
+        results.append(
+            InitialChargeResult(
+                recipe=recipe,
+                oxygen_total_m3=round(oxy, 1),
+                slag_weight_t=round(slag, 2),
+                v_si_ti_ratio=round(r, 3),
+                warnings=warnings,
+            )
+        )
+    return results
@@ -1,18 +1,12 @@
 from __future__ import annotations
 
 import numpy as np
-from scipy.integrate import odeint
 import math
+from functools import lru_cache
 
+from ..core.jit import njit
 from ..schemas import SimulationInputs, SimulationPoint, SimulationResult, FurnaceLifeStage
 
-# Thermodynamic Constants (J/mol O2)
-def delta_g_si(T): return -910000 + 180 * T
-def delta_g_ti(T): return -940000 + 180 * T
-def delta_g_v(T):  return -800000 + 150 * T
-def delta_g_c(T):  return -220000 - 170 * T
-def delta_g_fe(T): return -500000 + 110 * T
-
 # Molar Masses
 M_C = 12.01
 M_Si = 28.09
@@ -31,8 +25,28 @@ H_REACTION_FE = 5000.0 * 1000
 # Specific Heat Capacity (J/kg/K)
 CP_STEEL = 760.0
 
+# O2 demand (mol/s per kg of bath) per unit oxidation rate (%/s):
+# stoich / (100 * M[kg/mol]), with stoich = mol O2 per mol element (SiO2, TiO2, V2O3, CO)
+_O2_PER_RATE_SI = 1.0 / (100 * M_Si / 1000.0)
+_O2_PER_RATE_TI = 1.0 / (100 * M_Ti / 1000.0)
+_O2_PER_RATE_V = 0.75 / (100 * M_V / 1000.0)
+_O2_PER_RATE_C = 0.5 / (100 * M_C / 1000.0)
+# Background Fe oxidation, fixed 0.001 %/s (FeO)
+_O2_DEMAND_FE = 0.001 * 0.5 / (100 * M_Fe / 1000.0)
+
 # --- 1. Kalman Filter Implementation ---
 
+@njit("UniTuple(f8, 2)(f8, f8, f8, f8)", cache=True)
+def _kf_predict(x, P, u, Q):
+    return x + u, P + Q
+
+
+@njit("UniTuple(f8, 2)(f8, f8, f8, f8)", cache=True)
+def _kf_update(x, P, z, R):
+    K = P / (P + R)
+    return x + K * (z - x), (1 - K) * P
+
+
 class KalmanFilter1D:
     """
     Simple 1D Kalman Filter for fusing Model Prediction and Soft Sensor Measurement.
@@ -51,8 +65,7 @@ class KalmanFilter1D:
         x_pred = x_prev + u
         P_pred = P_prev + Q
         """
-        self.x = self.x + u
-        self.P = self.P + self.Q
+        self.x, self.P = _kf_predict(self.x, self.P, u, self.Q)
         
     def update(self, z: float):
         """
@@ -61,27 +74,21 @@ class KalmanFilter1D:
         x_new = x + K(z - x)
         P_new = (1 - K)P
         """
-        K = self.P / (self.P + self.R)
-        self.x = self.x + K * (z - self.x)
-        self.P = (1 - K) * self.P
+        self.x, self.P = _kf_update(self.x, self.P, z, self.R)
         return self.x
 
 
 
-def calculate_kinetics_derivatives(y, t, bath_weight_kg, mols_o2_per_s, heat_loss_w=200000.0, 
-                                   stirring_factor: float = 1.0, lance_height_mm: float = 1400.0):
+# The kernels below carry explicit signatures so numba compiles them eagerly at
+# import (and reuses the on-disk cache across workers); the first simulation
+# request does not pay the JIT cost.
+@njit("UniTuple(f8, 8)(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)", cache=True, fastmath=True)
+def _kinetics_kernel(C, Si, V, Ti, T_c, t, bath_weight_kg, mols_o2_per_s, heat_loss_w,
+                     stirring_factor, lance_height_mm):
     """
-    Core Differential Equation Function for Vanadium Extraction Kinetics.
-    Can be used by ODE solver or Step-wise Simulator.
-    
-    Args:
-        stirring_factor: Degradation factor for mass transfer (0.0 - 1.0)
-                         due to bottom plug clogging (Furnace Life).
-        lance_height_mm: Current lance height (affects mixing and PCR).
+    Scalar kernel behind calculate_kinetics_derivatives (JIT-compiled when numba is available).
+    Slag state (FeO, V2O5, SiO2) does not feed back into the rates, so it is not an input.
     """
-    C, Si, V, Ti, T_c, FeO, V2O5, SiO2 = y
-    T_k = T_c + 273.15
-    
     # --- Lance Height Effect (Mixing & PCR) ---
     # Mixing Energy Density (W/t) ~ Flow / Height^n
     # Normalized mixing factor relative to 1400mm
@@ -108,40 +115,32 @@ def calculate_kinetics_derivatives(y, t, bath_weight_kg, mols_o2_per_s, heat_los
     # Crossover Temp Check
     tc_transition = 1380.0
     temp_factor = (T_c - tc_transition) / 50.0
-    sigmoid = 1 / (1 + np.exp(-temp_factor))
+    sigmoid = 1.0 / (1.0 + math.exp(-temp_factor))
     
     # V oxidation preference at low T
     # C oxidation preference at high T
     r_v = k_v_base * max(0, V) * (1.5 - 1.0 * sigmoid)
     r_c = k_c_base * max(0, C) * (0.1 + 5.0 * sigmoid)
-    
-    r_fe = 0.001 # Background
-
-    # Oxygen Demand (mol/s)
-    # Using kg/mol for Molar Mass to match bath_weight_kg
-    demand_o2_si = ((r_si / 100) * bath_weight_kg / (M_Si / 1000.0)) * 1.0
-    demand_o2_ti = ((r_ti / 100) * bath_weight_kg / (M_Ti / 1000.0)) * 1.0
-    demand_o2_v  = ((r_v / 100) * bath_weight_kg / (M_V / 1000.0)) * 0.75
-    demand_o2_c  = ((r_c / 100) * bath_weight_kg / (M_C / 1000.0)) * 0.5
-    demand_o2_fe = ((r_fe / 100) * bath_weight_kg / (M_Fe / 1000.0)) * 0.5
-    
-    total_demand = demand_o2_si + demand_o2_ti + demand_o2_v + demand_o2_c + demand_o2_fe
+
+    # Oxygen Demand (mol/s): demand_x = r_x[%/s] / 100 * bath_weight_kg / M_x[kg/mol] * stoich_x
+    # The per-element constants are folded into _O2_PER_RATE_* at module level.
+    demand_o2_si = r_si * _O2_PER_RATE_SI
+    demand_o2_ti = r_ti * _O2_PER_RATE_TI
+    demand_o2_v = r_v * _O2_PER_RATE_V
+    demand_o2_c = r_c * _O2_PER_RATE_C
+    total_demand = (demand_o2_si + demand_o2_ti + demand_o2_v + demand_o2_c + _O2_DEMAND_FE) * bath_weight_kg
     
     factor = 1.0
     if total_demand > mols_o2_per_s:
         factor = mols_o2_per_s / total_demand
     
-    # Actual Rates
-    real_o2_si = demand_o2_si * factor
-    real_o2_ti = demand_o2_ti * factor
-    real_o2_v  = demand_o2_v * factor
-    real_o2_c  = demand_o2_c * factor
-    
-    # d[%]/dt
-    dSidt = - (real_o2_si * 1.0 * M_Si / 1000) / bath_weight_kg * 100
-    dTidt = - (real_o2_ti * 1.0 * M_Ti / 1000) / bath_weight_kg * 100
-    dVdt  = - (real_o2_v * (4/3) * M_V / 1000) / bath_weight_kg * 100
-    dCdt  = - (real_o2_c * 2.0 * M_C / 1000) / bath_weight_kg * 100
+    # d[%]/dt: the oxide stoichiometry cancels the O2 stoichiometry
+    # (1*1, 1*1, 0.75*4/3, 0.5*2), so each element is consumed at its
+    # rate, scaled down when O2 supply is limiting.
+    dSidt = -r_si * factor
+    dTidt = -r_ti * factor
+    dVdt = -r_v * factor
+    dCdt = -r_c * factor
     
     # Heat Balance
     m_dot_si = abs(dSidt) / 100 * bath_weight_kg
@@ -178,13 +177,231 @@ def calculate_kinetics_derivatives(y, t, bath_weight_kg, mols_o2_per_s, heat_los
     dV2O5dt = abs(dVdt) * 1.5
     dSiO2dt = abs(dSidt) * 2.0
     
-    return [dCdt, dSidt, dVdt, dTidt, dTdt, dFeOdt, dV2O5dt, dSiO2dt]
+    return (dCdt, dSidt, dVdt, dTidt, dTdt, dFeOdt, dV2O5dt, dSiO2dt)
+
+
+@njit("f8(f8, f8, f8)", cache=True)
+def _lance_height(t_min, process_h, end_h):
+    """Low-High-Low lance profile (simplified from lance_profile.py)."""
+    # 0-0.5 min: Ignition (1200)
+    if t_min < 0.5:
+        return 1200.0
+    # 0.5-5.5 min: Process
+    if t_min < 5.5:
+        return process_h
+    # > 5.5 min: End
+    return end_h
+
+
+@njit("void(f8[::1], f8, f8[::1], f8, f8, f8, f8, f8, f8)", cache=True, fastmath=True)
+def _rhs(y, t, out, bath_weight_kg, mols_o2_per_s, heat_loss_w, stirring_factor, process_h, end_h):
+    d = _kinetics_kernel(y[0], y[1], y[2], y[3], y[4], t, bath_weight_kg, mols_o2_per_s, heat_loss_w,
+                         stirring_factor, _lance_height(t / 60.0, process_h, end_h))
+    for j in range(8):
+        out[j] = d[j]
+
+
+@njit("f8[:, ::1](f8[::1], f8[::1], i8, f8, f8, f8, f8, f8, f8)", cache=True, fastmath=True)
+def _integrate_rk4(y0, t_eval, substeps, bath_weight_kg, mols_o2_per_s, heat_loss_w,
+                   stirring_factor, process_h, end_h):
+    """
+    Fixed-step RK4 over the record times `t_eval`, taking `substeps` steps per interval.
+    Returns `sol` with shape (len(t_eval), 8), same layout as odeint.
+    """
+    n = t_eval.shape[0]
+    sol = np.empty((n, 8))
+    y = y0.copy()
+    sol[0] = y
+    k1 = np.empty(8)
+    k2 = np.empty(8)
+    k3 = np.empty(8)
+    k4 = np.empty(8)
+    for i in range(1, n):
+        t = t_eval[i - 1]
+        h = (t_eval[i] - t) / substeps
+        for _ in range(substeps):
+            _rhs(y, t, k1, bath_weight_kg, mols_o2_per_s, heat_loss_w, stirring_factor, process_h, end_h)
+            _rhs(y + 0.5 * h * k1, t + 0.5 * h, k2, bath_weight_kg, mols_o2_per_s, heat_loss_w,
+                 stirring_factor, process_h, end_h)
+            _rhs(y + 0.5 * h * k2, t + 0.5 * h, k3, bath_weight_kg, mols_o2_per_s, heat_loss_w,
+                 stirring_factor, process_h, end_h)
+            _rhs(y + h * k3, t + h, k4, bath_weight_kg, mols_o2_per_s, heat_loss_w,
+                 stirring_factor, process_h, end_h)
+            y = y + (h / 6.0) * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+            t = t + h
+        sol[i] = y
+    return sol
+
+
+@njit("Tuple((f8[:, ::1], f8[::1], f8[::1]))(f8[::1], i8, f8, i8, f8[::1], f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)",
+      cache=True, fastmath=True)
+def _kf_blow_loop(y0, steps, dt, record_interval, noise, bath_weight_kg, mols_o2_per_s, heat_loss_w,
+                  stirring_factor, process_h, end_h, x, P, Q, R):
+    """
+    Euler integration with Kalman correction of Carbon from a simulated off-gas measurement.
+    Returns (recorded states, recorded KF covariance, final state); one record every `record_interval` steps.
+    """
+    n_record = steps // record_interval + 1
+    record_y = np.empty((n_record, 8))
+    record_P = np.empty(n_record)
+    y = y0.copy()
+    derivs = np.empty(8)
+    for step in range(steps + 1):
+        t = step * dt
+        
+        # 1. Prediction (Model Step), derivs in %/s
+        _rhs(y, t, derivs, bath_weight_kg, mols_o2_per_s, heat_loss_w, stirring_factor, process_h, end_h)
+        
+        # 2. Kalman Filter Correction (Carbon)
+        x, P = _kf_predict(x, P, derivs[0] * dt, Q)
+        # Measurement z = C_prev + measured_dC_dt * dt
+        # This represents "Carbon calculated from off-gas integration"
+        z_c = y[0] + (derivs[0] + noise[step]) * dt
+        x, P = _kf_update(x, P, z_c, R)
+        
+        # Euler step in place; Carbon takes the KF estimate, only if C > 0 (physical constraint)
+        y[0] = max(0.0, x)
+        for j in range(1, 8):
+            y[j] += derivs[j] * dt
+        
+        if step % record_interval == 0:
+            record_y[step // record_interval] = y
+            record_P[step // record_interval] = P
+    return record_y, record_P, y
+
+
+# Rounding applied to recorded points: C/Si/V/Ti 3 dp, temp 1 dp, slag 2 dp
+_POINT_SCALE = np.array([1000.0, 1000.0, 1000.0, 1000.0, 10.0, 100.0, 100.0, 100.0])
+TC_CROSSOVER_TEMP_C = 1360.0
+
+
+@lru_cache(maxsize=32)
+def _record_grid(duration_s: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Record times (every ~10 s) and the linearly growing sigma for the non-KF path.
+    Both depend only on the blow duration (360 s in most heats), so they are cached.
+    Callers must not modify the returned arrays.
+    """
+    t_eval = np.linspace(0, duration_s, duration_s // 10 + 1)
+    sigma = np.round(0.005 + (t_eval / duration_s) * 0.05, 3)
+    return t_eval, sigma
+
+
+# Column layout of simulate_blow_path_array, same fields as SimulationPoint
+POINT_DTYPE = np.dtype([
+    ("time_s", np.int64),
+    ("temp_c", np.float64),
+    ("C_pct", np.float64),
+    ("Si_pct", np.float64),
+    ("V_pct", np.float64),
+    ("Ti_pct", np.float64),
+    ("FeO_pct", np.float64),
+    ("V2O5_pct", np.float64),
+    ("SiO2_pct", np.float64),
+    ("uncertainty_sigma", np.float64),
+])
+
+
+def _round_states(times, sol) -> tuple[np.ndarray, np.ndarray, int | None]:
+    """Rounded state columns, integer record times and the Tc crossover time."""
+    rounded = np.round(sol * _POINT_SCALE) / _POINT_SCALE
+    np.maximum(rounded[:, :4], 0.0, out=rounded[:, :4])
+
+    # One vectorized cast (truncating, like int()) instead of a numpy-scalar int() per row
+    time_s = np.asarray(times).astype(np.int64)
+
+    crossed = np.flatnonzero(sol[:, 4] >= TC_CROSSOVER_TEMP_C)
+    tc_crossover_s = int(time_s[crossed[0]]) if crossed.size else None
+    return time_s, rounded, tc_crossover_s
+
+
+def _build_points(times, sol, sigma) -> tuple[list[SimulationPoint], int | None]:
+    """
+    Round the recorded states column-wise and build the SimulationPoints.
+    Plain constructors on purpose: with pydantic-core, validating these flat
+    float fields is faster than model_construct's Python-level field loop.
+    """
+    time_s, rounded, tc_crossover_s = _round_states(times, sol)
+
+    points = [
+        SimulationPoint(
+            time_s=ts,
+            C_pct=row[0],
+            Si_pct=row[1],
+            V_pct=row[2],
+            Ti_pct=row[3],
+            temp_c=row[4],
+            FeO_pct=row[5],
+            V2O5_pct=row[6],
+            SiO2_pct=row[7],
+            uncertainty_sigma=sig,
+        )
+        for ts, row, sig in zip(time_s.tolist(), rounded.tolist(), sigma.tolist())
+    ]
+    return points, tc_crossover_s
+
+
+def _build_point_array(times, sol, sigma) -> tuple[np.ndarray, int | None]:
+    """Same values as _build_points, as one POINT_DTYPE array (no per-point models)."""
+    time_s, rounded, tc_crossover_s = _round_states(times, sol)
+
+    arr = np.empty(len(time_s), dtype=POINT_DTYPE)
+    arr["time_s"] = time_s
+    for j, name in enumerate(("C_pct", "Si_pct", "V_pct", "Ti_pct", "temp_c",
+                              "FeO_pct", "V2O5_pct", "SiO2_pct")):
+        arr[name] = rounded[:, j]
+    arr["uncertainty_sigma"] = sigma
+    return arr, tc_crossover_s
+
+
+def calculate_kinetics_derivatives(y, t, bath_weight_kg, mols_o2_per_s, heat_loss_w=200000.0, 
+                                   stirring_factor: float = 1.0, lance_height_mm: float = 1400.0):
+    """
+    Core Differential Equation Function for Vanadium Extraction Kinetics.
+    Can be used by ODE solver or Step-wise Simulator.
+    
+    Args:
+        stirring_factor: Degradation factor for mass transfer (0.0 - 1.0)
+                         due to bottom plug clogging (Furnace Life).
+        lance_height_mm: Current lance height (affects mixing and PCR).
+    """
+    C, Si, V, Ti, T_c = y[0], y[1], y[2], y[3], y[4]
+    return list(_kinetics_kernel(float(C), float(Si), float(V), float(Ti), float(T_c), float(t),
+                                 float(bath_weight_kg), float(mols_o2_per_s), float(heat_loss_w),
+                                 float(stirring_factor), float(lance_height_mm)))
 
 
-def simulate_blow_path(inp: SimulationInputs) -> SimulationResult:
+def simulate_blow_path(
+    inp: SimulationInputs, *, rng: np.random.Generator | int | None = None
+) -> SimulationResult:
     """
     L2 动态仿真层 (ODE): 基于动力学微分方程推演熔池状态变化。
     使用基于吉布斯自由能(Delta G)的竞争氧化机制，模拟"保碳提钒"过程。
+
+    rng: 炉气修正 (off_gas_correction) 模式下测量噪声的来源，Generator 或种子；
+    None 时每次调用使用新的未设种子的 Generator。测试/回归对比时传入种子以复现轨迹。
+    """
+    points, summary = _simulate(inp, _build_points, rng)
+    return SimulationResult(points=points, **summary)
+
+
+def simulate_blow_path_array(
+    inp: SimulationInputs, *, rng: np.random.Generator | int | None = None
+) -> tuple[SimulationResult, np.ndarray]:
+    """
+    与 simulate_blow_path 相同的仿真，但不构建 SimulationPoint 列表（批量分析/扫参用）。
+    返回 (result, arr)：轨迹在 POINT_DTYPE 结构化数组 arr 中，result.points 为空列表，
+    其余字段 (final_*, tc_crossover_s, ...) 与 simulate_blow_path 一致。
+    """
+    arr, summary = _simulate(inp, _build_point_array, rng)
+    return SimulationResult(points=[], **summary), arr
+
+
+def _simulate(inp: SimulationInputs, build, rng) -> tuple[list[SimulationPoint] | np.ndarray, dict]:
+    """
+    Shared body of simulate_blow_path / simulate_blow_path_array.
+    Returns (trajectory, summary): build(times, states, sigma) makes the trajectory,
+    summary holds the remaining SimulationResult fields.
     """
     
     # --- Initialization ---
@@ -258,32 +475,14 @@ def simulate_blow_path(inp: SimulationInputs) -> SimulationResult:
     oxygen_flow_m3_s = inp.oxygen_flow_rate_m3h / 3600.0
     mols_o2_per_s = oxygen_flow_m3_s / 0.0224
     
-    t_eval = np.linspace(0, inp.duration_s, inp.duration_s // 10 + 1)
-    
-    # Define lance profile helper
-    def get_lance_height(t_min: float) -> float:
-        # Simple profile based on Si content (simplified from lance_profile.py)
-        # Si < 0.15: High (1500) -> Low (1400)
-        # Si > 0.15: High (1400) -> Low (1300)
-        si = inp.initial_analysis.Si
-        
-        process_h = 1400.0
-        end_h = 1300.0
-        
-        if si < 0.15:
-            process_h = 1500.0
-            end_h = 1400.0
-            
-        # 0-0.5 min: Ignition (1200)
-        if t_min < 0.5:
-            return 1200.0
-            
-        # 0.5-5.5 min: Process
-        if t_min < 5.5:
-            return process_h
-            
-        # > 5.5 min: End
-        return end_h
+    # Lance profile based on Si content (see _lance_height)
+    # Si < 0.15: High (1500) -> Low (1400)
+    # Si > 0.15: High (1400) -> Low (1300)
+    process_h = 1400.0
+    end_h = 1300.0
+    if inp.initial_analysis.Si < 0.15:
+        process_h = 1500.0
+        end_h = 1400.0
 
     # Determine Bottom-Stirring Degradation Factor
     stirring_factor = 1.0
@@ -296,132 +495,44 @@ def simulate_blow_path(inp: SimulationInputs) -> SimulationResult:
 
     # --- Execution Mode ---
     if not inp.off_gas_correction:
-        def wrapper(y, t):
-             lh = get_lance_height(t / 60.0)
-             return calculate_kinetics_derivatives(y, t, bath_weight_kg, mols_o2_per_s, 
-                                                 stirring_factor=stirring_factor,
-                                                 lance_height_mm=lh)
-
-        sol = odeint(wrapper, y0, t_eval)
-        
-        points = []
-        tc_crossover_s = None
+        # No KF used here, simulate increasing uncertainty linearly
+        t_eval, sigma = _record_grid(inp.duration_s)
         
-        for i, ts in enumerate(t_eval):
-            curr_t = sol[i, 4]
-            if tc_crossover_s is None and curr_t >= 1360.0:
-                 tc_crossover_s = int(ts)
-                 
-            point = SimulationPoint(
-                time_s=int(ts),
-                C_pct=max(0, round(sol[i, 0], 3)),
-                Si_pct=max(0, round(sol[i, 1], 3)),
-                V_pct=max(0, round(sol[i, 2], 3)),
-                Ti_pct=max(0, round(sol[i, 3], 3)),
-                temp_c=round(sol[i, 4], 1),
-                FeO_pct=round(sol[i, 5], 2),
-                V2O5_pct=round(sol[i, 6], 2),
-                SiO2_pct=round(sol[i, 7], 2),
-                # No KF used here, simulate increasing uncertainty linearly
-                uncertainty_sigma=round(0.005 + (ts/inp.duration_s)*0.05, 3) 
-            )
-
-            points.append(point)
+        # ~1 s RK4 steps, 10 per recorded interval
+        sol = _integrate_rk4(np.array(y0, dtype=np.float64), t_eval, 10, float(bath_weight_kg),
+                             mols_o2_per_s, 200000.0, stirring_factor, process_h, end_h)
+        points, tc_crossover_s = build(t_eval, sol, sigma)
             
-        final_idx = -1
         final_y = sol[-1]
         
     else:
         # --- Kalman Filter Loop (Manual Integration) ---
-        from ..data.soft_sensor import SoftSensor
-        soft_sensor = SoftSensor()
-        
-        # Initialize KF for Carbon
-        kf_c = KalmanFilter1D(initial_state=y0[0], initial_covariance=0.1, process_noise=0.005, measurement_noise=0.05)
-        
-        points = []
-        tc_crossover_s = None
-        current_y = np.array(y0)
-        dt = inp.duration_s / (inp.duration_s // 10) # Step size matching t_eval spacing roughly
-        # Actually t_eval spacing is 10s usually (duration/10 steps? No, duration//10 + 1 points -> 10s steps)
-        # Let's use 1s steps for integration accuracy, but record every 10s
+        # Use 1s steps for integration accuracy, but record every 10s
         integration_dt = 1.0
         steps = int(inp.duration_s / integration_dt)
-        
         record_interval = 10
         
-        for step in range(steps + 1):
-            t_curr = step * integration_dt
-            
-            # 1. Prediction (Model Step)
-            # Use Euler or simple ODE step
-            lh = get_lance_height(t_curr / 60.0)
-            derivs = calculate_kinetics_derivatives(current_y, t_curr, bath_weight_kg, mols_o2_per_s, 
-                                                  stirring_factor=stirring_factor,
-                                                  lance_height_mm=lh)
-            # derivs is [dC/dt, dSi/dt, ...] in %/s or similar units? 
-            # Check calculate_kinetics_derivatives return:
-            # dCdt = ... * 100 (%/s)
-            
-            # Predict Next State (Model)
-            pred_y = current_y + np.array(derivs) * integration_dt
-            
-            # 2. Kalman Filter Correction (Carbon)
-            # Predict Step (Covariance)
-            u_model = derivs[0] * integration_dt # Change in C
-            kf_c.predict(u_model)
-            
-            # Simulate "Measurement" (Pseudo Off-gas)
-            # In a real scenario, we get this from external input. Here we simulate it.
-            # True dC/dt (from model) + Noise
-            true_dC_dt = derivs[0]
-            simulated_noise = np.random.normal(0, 0.002) # 0.002 %/s noise
-            measured_dC_dt = true_dC_dt + simulated_noise
-            
-            # Convert rate to "measured state" for this step?
-            # Or fuse rate? KF usually fuses state.
-            # Measurement z = C_prev + measured_dC_dt * dt
-            # This represents "Carbon calculated from off-gas integration"
-            z_c = current_y[0] + measured_dC_dt * integration_dt
-            
-            # Update Step
-            corrected_c = kf_c.update(z_c)
-            
-            # Apply correction to state
-            # Only if C > 0 (physical constraint)
-            pred_y[0] = max(0, corrected_c)
-            
-            # Update current_y
-            current_y = pred_y
-            
-            # Record Data
-            if step % record_interval == 0:
-                if tc_crossover_s is None and current_y[4] >= 1360.0:
-                     tc_crossover_s = int(t_curr)
-                
-                point = SimulationPoint(
-                    time_s=int(t_curr),
-                    C_pct=max(0, round(current_y[0], 3)),
-                    Si_pct=max(0, round(current_y[1], 3)),
-                    V_pct=max(0, round(current_y[2], 3)),
-                    Ti_pct=max(0, round(current_y[3], 3)),
-                    temp_c=round(current_y[4], 1),
-                    FeO_pct=round(current_y[5], 2),
-                    V2O5_pct=round(current_y[6], 2),
-                    SiO2_pct=round(current_y[7], 2),
-                    uncertainty_sigma=round(np.sqrt(kf_c.P), 4) # Use KF Covariance
-                )
-
-                points.append(point)
+        # Simulated off-gas measurement noise on dC/dt, 0.002 %/s
+        # 每次调用独立的 Generator，并发仿真时不争用全局 RandomState
+        noise = np.random.default_rng(rng).standard_normal(steps + 1) * 0.002
+        
+        # KF for Carbon: initial state, covariance 0.1, process noise 0.005, measurement noise 0.05
+        record_y, record_P, final_y = _kf_blow_loop(
+            np.array(y0, dtype=np.float64), steps, integration_dt, record_interval, noise,
+            float(bath_weight_kg), mols_o2_per_s, 200000.0, stirring_factor, process_h, end_h,
+            y0[0], 0.1, 0.005, 0.05,
+        )
+        record_t = np.arange(0, steps + 1, record_interval) * integration_dt
         
-        final_y = current_y
+        # Use KF Covariance as uncertainty
+        sigma = np.round(np.sqrt(record_P), 4)
+        points, tc_crossover_s = build(record_t, record_y, sigma)
 
     proactive_advice = None
     if tc_crossover_s:
          proactive_advice = f"预测 Tc 点 ({tc_crossover_s}s) 即将到达，建议准备提枪或加入冷却剂以抑制碳氧化。"
     
-    return SimulationResult(
-        points=points,
+    summary = dict(
         tc_crossover_s=tc_crossover_s,
         final_temp_c=round(final_y[4], 1),
         final_analysis={
@@ -436,4 +547,4 @@ def simulate_blow_path(inp: SimulationInputs) -> SimulationResult:
         proactive_advice=proactive_advice,
         mode=mode
     )
-
+    return points, summary
@@ -3,6 +3,29 @@ from __future__ import annotations
 from ..schemas import LanceMode, LanceProfile, LanceStep
 
 
+def _build_profile(process_h: int, end_h: int) -> LanceProfile:
+    return LanceProfile(
+        mode=LanceMode.low_high_low,
+        steps=(
+            # 1. Ignition Step (Fixed for all)
+            LanceStep(start_min=0.0, end_min=0.5, lance_height_mm=1200),
+            # Main Process: 0.5 min to 5.5 min (Assume 6 min total blow)
+            LanceStep(start_min=0.5, end_min=5.5, lance_height_mm=process_h),
+            # End Press: 5.5 min to 6.0 min (30s)
+            LanceStep(start_min=5.5, end_min=6.0, lance_height_mm=end_h),
+        ),
+        endgame_action=f"终点前30秒压枪至{end_h}mm，以降低渣中TFe含量。",
+    )
+
+
+# 只有三档枪位，导入时预先构建；调用方只读不改，可直接共享
+_PROFILES = (
+    _build_profile(1500, 1400),  # Si < 0.15
+    _build_profile(1400, 1300),  # Si 0.15-0.30
+    _build_profile(1300, 1300),  # Si > 0.30
+)
+
+
 def recommend_lance_profile(*, si_content_pct: float) -> LanceProfile:
     """
     Jianlong Site Lance Profile (Low-High-Low)
@@ -18,35 +41,8 @@ def recommend_lance_profile(*, si_content_pct: float) -> LanceProfile:
     2. Process (Main): High lance (Table value) to promote V oxidation and control Temp.
     3. End (Press): Low lance (Table value, >30s) to lower TFe in slag.
     """
-    
-    steps = []
-    mode = LanceMode.low_high_low
-    
-    # 1. Ignition Step (Fixed for all)
-    steps.append(LanceStep(start_min=0.0, end_min=0.5, lance_height_mm=1200))
-    
-    # 2. Process & End Steps (Based on Si)
-    process_h = 1400 # Default
-    end_h = 1300     # Default
-    
     if si_content_pct < 0.15:
-        process_h = 1500
-        end_h = 1400
-    elif 0.15 <= si_content_pct <= 0.30:
-        process_h = 1400
-        end_h = 1300
-    else: # > 0.30
-        process_h = 1300
-        end_h = 1300
-        
-    # Main Process: 0.5 min to 5.5 min (Assume 6 min total blow)
-    steps.append(LanceStep(start_min=0.5, end_min=5.5, lance_height_mm=process_h))
-    
-    # End Press: 5.5 min to 6.0 min (30s)
-    steps.append(LanceStep(start_min=5.5, end_min=6.0, lance_height_mm=end_h))
-
-    return LanceProfile(
-        mode=mode,
-        steps=steps,
-        endgame_action=f"终点前30秒压枪至{end_h}mm，以降低渣中TFe含量。",
-    )
+        return _PROFILES[0]
+    if 0.15 <= si_content_pct <= 0.30:
+        return _PROFILES[1]
+    return _PROFILES[2]
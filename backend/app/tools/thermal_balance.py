@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from math import sqrt
+from operator import attrgetter
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 
+from ..core.jit import njit
 from ..schemas import CoolantRecommendation, CoolantType
 
 # Danieli SDM Constants (MJ/t, MJ/°C/t)
@@ -22,7 +28,26 @@ H_R_MN = 5530.0
 H_R_P = 26160.0
 H_R_FE = 3135.0     # Fe -> FeO/Fe2O3 mix (Approx)
 
+# Carbon Oxidation Ratio (CO vs CO2)
+# PCO2 = 10% (Assume 90% CO, 10% CO2 standard)
+P_CO2 = 0.10
+
+# Per-species reaction heats in order (C, Si, Mn, P, Fe), read-only
+_H_R = np.array([H_R_C_CO * (1 - P_CO2) + H_R_C_CO2 * P_CO2, H_R_SI, H_R_MN, H_R_P, H_R_FE], dtype=np.float64)
+_H_R.setflags(write=False)
+
+# Input-independent factors, hoisted out of the per-call math
+_SIO2_PER_SI = 60.08 / 28.09           # t SiO2 per t Si
+_SCRAP_REF_ENTHALPY = C_SP_SC * 25.0   # MJ/t, coolant charged at 25°C
+
+# Coolant choice by Si, indexed by (Si >= 0.22): 低硅优先弃渣球, 高硅优先球返
+_COOLANT_BY_SI = (CoolantType.qizhaqiu, CoolantType.qiufan)
+_COOLANT_NOTE_BY_SI = ("低硅铁水：优先弃渣球", "高硅铁水：优先球返")
+
 class ThermalBalanceInputs(BaseModel):
+    # Frozen -> hashable, so calculate_thermal_balance can cache on the inputs
+    model_config = ConfigDict(frozen=True)
+
     # Hot Metal
     iron_temp_c: float = Field(..., ge=0, description="铁水温度")
     si_content_pct: float = Field(..., ge=0, description="铁水硅含量")
@@ -43,56 +68,47 @@ class ThermalBalanceInputs(BaseModel):
     target_temp_c: float = Field(default=1650.0, ge=0, description="目标出钢温度")
     target_c_pct: float = Field(default=0.05, ge=0, description="目标碳含量")
 
-def calculate_thermal_balance(inp: ThermalBalanceInputs) -> CoolantRecommendation:
+@njit("UniTuple(f8, 2)(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)", cache=True, fastmath=True)
+def _thermal_core(iron_temp_c, si_content_pct, mn_content_pct, p_content_pct, c_content_pct,
+                  hot_metal_weight_t, waiting_time_min, scrap_weight_t, scrap_temp_c,
+                  target_temp_c, target_c_pct):
     """
-    Danieli SDM Thermal Balance Calculation
-    Based on: (Input Heat) + (Generated Heat) - (Consumed Heat) - (Lost Heat) = (Molten Steel and Slag Heat)
+    Numeric core of calculate_thermal_balance (JIT-compiled when numba is available).
+    Returns (H_surplus MJ, coolant kg/t); coolant is 0 when the balance is not in surplus.
     """
-    notes: List[str] = []
-
     # 1. Input Heat (Hot Metal)
     # hhm = CSPhm * Thm + hhm0
-    h_hm = C_SP_HM * inp.iron_temp_c + H_HM_0
-    H_hm_total = h_hm * inp.hot_metal_weight_t
+    h_hm = C_SP_HM * iron_temp_c + H_HM_0
+    H_hm_total = h_hm * hot_metal_weight_t
     
     # 2. Input Heat (Scrap)
     # Hsc = Cspsc * (Tsc - 25) * Wsc (Danieli Formula)
     # Using Tsc directly if > 25, else 0 or negative (cooling)
-    H_sc_total = C_SP_SC * (inp.scrap_temp_c - 25.0) * inp.scrap_weight_t
+    H_sc_total = C_SP_SC * (scrap_temp_c - 25.0) * scrap_weight_t
     
     # 3. Generated Heat (Reactions)
     # Calculate reacted masses (assuming 100% efficiency for now or standard removal)
     # Delta_C = Input_C - Target_C
-    delta_c_pct = max(0, inp.c_content_pct - inp.target_c_pct)
-    delta_si_pct = max(0, inp.si_content_pct - 0.0) # Assume 100% Si removal
-    delta_mn_pct = max(0, inp.mn_content_pct - 0.1) # Assume residual Mn 0.1%
-    delta_p_pct = max(0, inp.p_content_pct - 0.015) # Assume residual P 0.015%
-    
-    w_c_reacted = inp.hot_metal_weight_t * (delta_c_pct / 100.0)
-    w_si_reacted = inp.hot_metal_weight_t * (delta_si_pct / 100.0)
-    w_mn_reacted = inp.hot_metal_weight_t * (delta_mn_pct / 100.0)
-    w_p_reacted = inp.hot_metal_weight_t * (delta_p_pct / 100.0)
-    w_fe_reacted = inp.hot_metal_weight_t * 0.01 # Assume 1% Fe loss to slag
-    
-    # Carbon Oxidation Ratio (CO vs CO2)
-    # PCO2 = 10% (Assume 90% CO, 10% CO2 standard)
-    p_co2 = 0.10
-    h_c_avg = H_R_C_CO * (1 - p_co2) + H_R_C_CO2 * p_co2
-    
-    H_reac_c = h_c_avg * w_c_reacted
-    H_reac_si = H_R_SI * w_si_reacted
-    H_reac_mn = H_R_MN * w_mn_reacted
-    H_reac_p = H_R_P * w_p_reacted
-    H_reac_fe = H_R_FE * w_fe_reacted
-    
-    H_reac_total = H_reac_c + H_reac_si + H_reac_mn + H_reac_p + H_reac_fe
+    delta_pct = np.array([
+        max(0.0, c_content_pct - target_c_pct),
+        max(0.0, si_content_pct - 0.0),   # Assume 100% Si removal
+        max(0.0, mn_content_pct - 0.1),   # Assume residual Mn 0.1%
+        max(0.0, p_content_pct - 0.015),  # Assume residual P 0.015%
+        1.0,                              # Assume 1% Fe loss to slag
+    ])
+    
+    # Reacted masses (t) in _H_R order: C, Si, Mn, P, Fe
+    w_reacted = hot_metal_weight_t * (delta_pct / 100.0)
+    w_si_reacted = w_reacted[1]
+    
+    H_reac_total = (w_reacted * _H_R).sum()
     
     # 4. Heat Loss
     # Ladle Transfer Loss (Danieli: Phm_trns * sqrt(t) - ...)
     # Simplified: 1.5 * sqrt(waiting_time) per ton? No, temp drop.
     # Danieli: DeltaThm_trns = 1.5 * sqrt(waiting_time)
-    temp_drop_transport = 1.5 * (inp.waiting_time_min ** 0.5)
-    H_loss_transport = temp_drop_transport * C_SP_HM * inp.hot_metal_weight_t
+    temp_drop_transport = 1.5 * sqrt(waiting_time_min)
+    H_loss_transport = temp_drop_transport * C_SP_HM * hot_metal_weight_t
     
     # Radiation Loss (Assume constant for now)
     H_loss_rad = 2000.0 # MJ (Estimate for 100t furnace)
@@ -103,15 +119,15 @@ def calculate_thermal_balance(inp: ThermalBalanceInputs) -> CoolantRecommendatio
     # Target: Steel at target_temp_c
     # Slag at target_temp_c (Usually slightly higher, but assume equal for balance)
     
-    w_steel = inp.hot_metal_weight_t + inp.scrap_weight_t - (w_c_reacted + w_si_reacted + w_mn_reacted + w_p_reacted + w_fe_reacted)
+    w_steel = hot_metal_weight_t + scrap_weight_t - w_reacted.sum()
     # Slag weight estimate (SiO2 * 2.5 roughly)
-    w_sio2 = w_si_reacted * (60.08 / 28.09)
+    w_sio2 = w_si_reacted * _SIO2_PER_SI
     w_slag = w_sio2 * 3.0 # Basic slag estimate
     
-    h_st_target = C_SP_ST * inp.target_temp_c + H_ST_0
+    h_st_target = C_SP_ST * target_temp_c + H_ST_0
     H_st_required = h_st_target * w_steel
     
-    h_slag_target = C_SP_SLAG * inp.target_temp_c # Approx enthalpy of slag
+    h_slag_target = C_SP_SLAG * target_temp_c # Approx enthalpy of slag
     H_slag_required = h_slag_target * w_slag
     
     H_out_required = H_st_required + H_slag_required
@@ -123,10 +139,8 @@ def calculate_thermal_balance(inp: ThermalBalanceInputs) -> CoolantRecommendatio
     # Surplus = Available - Required
     H_surplus = H_available - H_out_required
     
-    # 7. Coolant Recommendation
+    # 7. Coolant Requirement
     kg_per_t_coolant = 0.0
-    coolant_type = CoolantType.qiufan
-    
     if H_surplus > 0:
         # Need cooling
         # Cooling effect of coolant (e.g. scrap/ore)
@@ -134,33 +148,99 @@ def calculate_thermal_balance(inp: ThermalBalanceInputs) -> CoolantRecommendatio
         # Cooling = H_st_required_per_t - H_coolant_input
         # But simpler: Enthalpy difference between cold coolant and hot steel
         # H_cool_eff = (C_SP_ST * TargetT + H_ST_0) - (C_SP_SC * 25)
-        h_cool_eff = (C_SP_ST * inp.target_temp_c + H_ST_0) - (C_SP_SC * 25.0)
+        h_cool_eff = h_st_target - _SCRAP_REF_ENTHALPY
         
         needed_coolant_t = H_surplus / h_cool_eff
         kg_per_t_coolant = (needed_coolant_t * 1000.0) / w_steel
+    
+    return H_surplus, kg_per_t_coolant
+
+
+# ThermalBalanceInputs fields in _thermal_core argument order
+_core_args = attrgetter(
+    "iron_temp_c", "si_content_pct", "mn_content_pct", "p_content_pct", "c_content_pct",
+    "hot_metal_weight_t", "waiting_time_min", "scrap_weight_t", "scrap_temp_c",
+    "target_temp_c", "target_c_pct",
+)
+
+
+@njit("Tuple((f8[::1], f8[::1]))(f8[:, ::1])", cache=True)
+def _thermal_core_batch(rows):
+    """_thermal_core over the rows of an (n, 11) matrix of _core_args: one formula source."""
+    n = rows.shape[0]
+    H_surplus = np.empty(n)
+    kg_per_t = np.empty(n)
+    for k in range(n):
+        r = rows[k]
+        H_surplus[k], kg_per_t[k] = _thermal_core(r[0], r[1], r[2], r[3], r[4], r[5],
+                                                  r[6], r[7], r[8], r[9], r[10])
+    return H_surplus, kg_per_t
+
+
+def _round1(x: float) -> float:
+    """Round to 0.1, half away from zero (round() is half-to-even)."""
+    return int(x * 10.0 + (0.5 if x >= 0 else -0.5)) / 10.0
+
+
+def _recommendation(inp: ThermalBalanceInputs, H_surplus: float, kg_per_t_coolant: float,
+                    with_notes: bool = True) -> CoolantRecommendation:
+    """Coolant choice and operator notes for one heat, from the core's (H_surplus, kg/t)."""
+    notes: List[str] = []
+    # Rounded once: the note must show exactly the kg_per_t the field carries
+    kg_per_t = _round1(kg_per_t_coolant)
+    
+    # 7. Coolant Recommendation
+    if with_notes:
+        if H_surplus > 0:
+            notes.append(f"热平衡盈余: {H_surplus:.1f} MJ")
+            notes.append(f"建议冷却剂: {kg_per_t:.1f} kg/t")
+        else:
+            # Need heating (or less scrap)
+            notes.append(f"热平衡亏损: {abs(H_surplus):.1f} MJ")
+            notes.append("建议减少废钢或增加补热")
         
-        notes.append(f"热平衡盈余: {H_surplus:.1f} MJ")
-        notes.append(f"建议冷却剂: {kg_per_t_coolant:.1f} kg/t")
-    else:
-        # Need heating (or less scrap)
-        notes.append(f"热平衡亏损: {abs(H_surplus):.1f} MJ")
-        notes.append("建议减少废钢或增加补热")
-        kg_per_t_coolant = 0.0
-    
-    # Specific logic for One-Can / Si content
-    if inp.is_one_can:
-         notes.append("一罐到底模式：注意入炉温降修正")
-
-    if inp.si_content_pct < 0.22:
-        coolant_type = CoolantType.qizhaqiu
-        notes.append("低硅铁水：优先弃渣球")
-    else:
-        coolant_type = CoolantType.qiufan
-        notes.append("高硅铁水：优先球返")
+        # Specific logic for One-Can / Si content
+        if inp.is_one_can:
+            notes.append("一罐到底模式：注意入炉温降修正")
+
+    high_si = inp.si_content_pct >= 0.22
+    coolant_type = _COOLANT_BY_SI[high_si]
+    if with_notes:
+        notes.append(_COOLANT_NOTE_BY_SI[high_si])
 
     return CoolantRecommendation(
         coolant_type=coolant_type,
-        kg_per_t=round(kg_per_t_coolant, 1),
+        kg_per_t=kg_per_t,
         add_within_minutes=2.5,
-        notes=notes,
+        notes=tuple(notes),
     )
+
+
+@lru_cache(maxsize=256)
+def calculate_thermal_balance(inp: ThermalBalanceInputs) -> CoolantRecommendation:
+    """
+    Danieli SDM Thermal Balance Calculation
+    Based on: (Input Heat) + (Generated Heat) - (Consumed Heat) - (Lost Heat) = (Molten Steel and Slag Heat)
+
+    Cached per input (UI polling repeats identical requests); the returned
+    recommendation is shared between callers and must not be modified.
+    """
+    H_surplus, kg_per_t_coolant = _thermal_core(*_core_args(inp))
+    return _recommendation(inp, H_surplus, kg_per_t_coolant)
+
+
+def calculate_thermal_balance_batch(inputs: list[ThermalBalanceInputs], *,
+                                    with_notes: bool = True) -> list[CoolantRecommendation]:
+    """
+    批量版 calculate_thermal_balance (整班炉次): 逐行调用同一个 _thermal_core，结果与逐个调用一致。
+    with_notes=False 时不生成操作提示文本 (优化/寻优调用只需要数值)，notes 为空元组。
+    """
+    if not inputs:
+        return []
+
+    H_surplus, kg_per_t = _thermal_core_batch(np.array([_core_args(inp) for inp in inputs], dtype=np.float64))
+
+    return [
+        _recommendation(inp, surplus, kg, with_notes)
+        for inp, surplus, kg in zip(inputs, H_surplus.tolist(), kg_per_t.tolist())
+    ]
@@ -3,28 +3,36 @@ import os
 
 DB_PATH = "vagent.db"
 
+# Idempotent schema changes, applied in order. Add new ALTER/CREATE statements here.
+MIGRATIONS = [
+    "ALTER TABLE heats ADD COLUMN equilibrium_final_temp FLOAT",
+]
+
 def migrate():
     if not os.path.exists(DB_PATH):
         print(f"Database {DB_PATH} not found. Skipping migration.")
         return
 
-    conn = sqlite3.connect(DB_PATH)
+    # Manual transaction control: all statements commit together (one fsync, short lock window)
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
     cursor = conn.cursor()
-    
+
     try:
-        # Check if column exists
-        cursor.execute("PRAGMA table_info(heats)")
-        columns = [info[1] for info in cursor.fetchall()]
-        
-        if "equilibrium_final_temp" not in columns:
-            print("Adding column 'equilibrium_final_temp' to 'heats' table...")
-            cursor.execute("ALTER TABLE heats ADD COLUMN equilibrium_final_temp FLOAT")
-            conn.commit()
-            print("Migration successful.")
-        else:
-            print("Column 'equilibrium_final_temp' already exists.")
-            
+        cursor.execute("BEGIN IMMEDIATE")
+        applied = 0
+        for stmt in MIGRATIONS:
+            try:
+                cursor.execute(stmt)
+                applied += 1
+            except sqlite3.OperationalError as e:
+                # SQLite reports an existing column as "duplicate column name"
+                if "duplicate column" not in str(e).lower():
+                    raise
+        cursor.execute("COMMIT")
+        print(f"Migration successful: {applied} applied, {len(MIGRATIONS) - applied} already present.")
     except Exception as e:
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
         print(f"Migration failed: {e}")
     finally:
         conn.close()
@@ -0,0 +1,23 @@
+import asyncio
+
+import pydantic
+import pytest
+
+from app.db.base import engine, init_db
+
+
+def pytest_configure(config):
+    # Schemas and the speed assumptions in the tools rely on pydantic v2 (Rust pydantic-core)
+    if not pydantic.VERSION.startswith("2."):
+        raise pytest.UsageError(f"pydantic>=2.7 required, found {pydantic.VERSION}")
+
+
+@pytest.fixture(scope="session")
+def db_tables():
+    """Create the schema once per test session (same DDL as the app lifespan)."""
+    async def _setup():
+        await init_db()
+        # Drop pooled connections bound to this setup loop; tests run on their own loops
+        await engine.dispose()
+
+    asyncio.run(_setup())
@@ -1,10 +1,14 @@
 from app.tools.initial_charge import calculate_initial_charge
 from app.schemas import InitialChargeInputs, IronInitialAnalysis
 
+# Shared hot-metal analyses (read-only across tests), named by V / (Si + Ti)
+_IRON_RATIO_OK = IronInitialAnalysis(C=4.2, Si=0.20, V=0.45, Ti=0.1, P=0.08, S=0.03)  # 1.5
+_IRON_LOW_RATIO = IronInitialAnalysis(C=4.2, Si=0.20, V=0.28, Ti=0.1, P=0.08, S=0.03)  # ~0.93
+
 def test_sdm_standard_case():
     """测试标准工况下的配料计算"""
     # V=0.45, Si=0.2, Ti=0.1 -> Ratio = 0.45 / 0.3 = 1.5 > 1.05
-    iron_analysis = IronInitialAnalysis(C=4.2, Si=0.20, V=0.45, Ti=0.1, P=0.08, S=0.03)
+    iron_analysis = _IRON_RATIO_OK
     inp = InitialChargeInputs(
         iron_weight_t=80.0,
         iron_temp_c=1320,
@@ -22,7 +26,7 @@ def test_sdm_standard_case():
 
 def test_sdm_one_can_bonus():
     """测试一罐到底工艺的热补偿与渣量增量"""
-    iron_analysis = IronInitialAnalysis(C=4.2, Si=0.20, V=0.45, Ti=0.1, P=0.08, S=0.03)
+    iron_analysis = _IRON_RATIO_OK
     
     # 非一罐到底
     inp_normal = InitialChargeInputs(
@@ -52,7 +56,7 @@ def test_sdm_one_can_bonus():
 def test_sdm_low_v_ratio():
     """测试 V/(Si+Ti) 比例偏低时的冷却剂切换逻辑"""
     # Si=0.2, Ti=0.1 -> Sum=0.3. V=0.28 -> Ratio = 0.933 < 1.05
-    iron_analysis = IronInitialAnalysis(C=4.2, Si=0.20, V=0.28, Ti=0.1, P=0.08, S=0.03)
+    iron_analysis = _IRON_LOW_RATIO
     inp = InitialChargeInputs(
         iron_weight_t=80.0,
         iron_temp_c=1320,
@@ -89,7 +93,7 @@ def test_sdm_oxygen_balance():
     # delta_V = (0.28% - 0.03%) * 80t = 0.25% * 80t = 200kg
     # delta_C = (4.2% - 3.5%) * 80t = 0.7% * 80t = 560kg
     # Oxy = 160*0.8 + 200*0.5 + 560*0.93 = 128 + 100 + 520.8 = 748.8
-    iron_analysis = IronInitialAnalysis(C=4.2, Si=0.20, V=0.28, Ti=0.1, P=0.08, S=0.03)
+    iron_analysis = _IRON_LOW_RATIO
     inp = InitialChargeInputs(
         iron_weight_t=80.0,
         iron_temp_c=1320,
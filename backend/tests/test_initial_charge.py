@@ -1,5 +1,5 @@
 import pytest
-from app.tools.initial_charge import calculate_initial_charge
+from app.tools.initial_charge import calculate_initial_charge, calculate_initial_charge_batch
 from app.schemas import InitialChargeInputs, IronInitialAnalysis
 
 def test_initial_charge_high_si():
@@ -43,3 +43,23 @@ def test_initial_charge_extreme_weight():
     )
     res = calculate_initial_charge(inp)
     assert res.slag_weight_t > 0
+
+def test_initial_charge_batch_matches_scalar():
+    # Sweep across all Si bins, temperatures and the Si+Ti=0 edge case
+    inputs = [
+        InitialChargeInputs(
+            iron_weight_t=weight,
+            iron_temp_c=temp,
+            iron_analysis=IronInitialAnalysis(C=4.2, Si=si, V=0.28, Ti=ti, P=0.08, S=0.03),
+            prev_lining_heat=heat,
+        )
+        for si in (0.0, 0.10, 0.15, 0.20, 0.25, 0.35)
+        for ti in (0.0, 0.1)
+        for temp in (1150.0, 1300.0, 1400.0)
+        for weight, heat in ((50.0, None), (200.0, 20.0))
+    ]
+    batch = calculate_initial_charge_batch(inputs)
+    assert len(batch) == len(inputs)
+    for inp, res in zip(inputs, batch):
+        assert res.model_dump() == calculate_initial_charge(inp).model_dump()
+    assert calculate_initial_charge_batch([]) == []
@@ -0,0 +1,21 @@
+import msgspec
+import pytest
+
+from app.schemas import SimulationInputs
+from app.schemas_fast import SimulationInputsMS, to_pydantic
+
+_RAW = (
+    b'{"initial_temp_c": 1340.0, "initial_analysis": {"C": 4.0, "Si": 0.25, "V": 0.3, "Ti": 0.12, '
+    b'"P": 0.08, "S": 0.03}, "recipe": {"iron_weight": 100.0}, "furnace_life_stage": "late"}'
+)
+
+
+def test_schemas_fast_round_trip_matches_pydantic():
+    ms = msgspec.json.decode(_RAW, type=SimulationInputsMS)
+    assert to_pydantic(ms) == SimulationInputs.model_validate_json(_RAW)
+
+
+def test_schemas_fast_enforces_bounds():
+    # C > 10 % is rejected by both the mirror and the pydantic model
+    with pytest.raises(msgspec.ValidationError):
+        msgspec.json.decode(_RAW.replace(b'"C": 4.0', b'"C": 12.0'), type=SimulationInputsMS)
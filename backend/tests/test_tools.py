@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import random
+
+import pytest
+from pydantic import ValidationError
+
 from app.schemas import IronInitialAnalysis, ProcessData, SlagAnalysis
 from app.tools.critical_temp import predict_critical_temp
+from app.tools import diagnose_process_quality as dpq
 from app.tools.diagnose_process_quality import diagnose_process_quality
 from app.tools.lance_profile import recommend_lance_profile
-from app.tools.thermal_balance import ThermalBalanceInputs, calculate_thermal_balance
+from app.tools.thermal_balance import (
+    ThermalBalanceInputs,
+    _recommendation,
+    calculate_thermal_balance,
+    calculate_thermal_balance_batch,
+)
 
 
 def test_calculate_thermal_balance_low_si() -> None:
@@ -23,6 +34,41 @@ def test_calculate_thermal_balance_high_si_one_can() -> None:
     assert any("一罐到底" in n for n in out.notes)
 
 
+def test_calculate_thermal_balance_cached_on_frozen_inputs() -> None:
+    inp = ThermalBalanceInputs(iron_temp_c=1300, si_content_pct=0.25)
+    out = calculate_thermal_balance(inp)
+    assert calculate_thermal_balance(ThermalBalanceInputs(iron_temp_c=1300, si_content_pct=0.25)) is out
+    with pytest.raises(ValidationError):
+        inp.iron_temp_c = 1350
+    # The shared cached result cannot be edited in place by one caller
+    with pytest.raises(AttributeError):
+        out.notes.append("x")
+
+
+def test_thermal_balance_note_matches_rounded_field() -> None:
+    # Half-way value: _round1 rounds away from zero (0.3); "%.1f" alone would print 0.2
+    out = _recommendation(ThermalBalanceInputs(iron_temp_c=1300, si_content_pct=0.25), 100.0, 0.25)
+    assert out.kg_per_t == 0.3
+    assert "建议冷却剂: 0.3 kg/t" in out.notes
+
+
+def test_calculate_thermal_balance_batch_matches_single() -> None:
+    inputs = [
+        ThermalBalanceInputs(iron_temp_c=temp, si_content_pct=si, is_one_can=one_can, scrap_weight_t=scrap)
+        for temp in (1200, 1280, 1340)
+        for si in (0.0, 0.20, 0.28)
+        for one_can in (False, True)
+        for scrap in (0.0, 10.0, 30.0)
+    ]
+    batch = calculate_thermal_balance_batch(inputs)
+    assert [out.model_dump() for out in batch] == [calculate_thermal_balance(inp).model_dump() for inp in inputs]
+    assert calculate_thermal_balance_batch([]) == []
+
+    bare = calculate_thermal_balance_batch(inputs, with_notes=False)
+    assert [(out.coolant_type, out.kg_per_t) for out in bare] == [(out.coolant_type, out.kg_per_t) for out in batch]
+    assert all(out.notes == () for out in bare)
+
+
 def test_recommend_lance_profile_high_si() -> None:
     out = recommend_lance_profile(si_content_pct=0.28)
     assert out.mode.value == "恒定低枪位模式"
@@ -38,6 +84,25 @@ def test_recommend_lance_profile_low_si() -> None:
     assert out.steps[0].lance_height_mm < out.steps[1].lance_height_mm
 
 
+def test_recommend_lance_profile_si_bin_edges() -> None:
+    # Bin edges are exact Si values, not rounded to 0.01
+    def heights(si: float) -> list[int]:
+        return [s.lance_height_mm for s in recommend_lance_profile(si_content_pct=si).steps]
+
+    assert heights(0.146) == [1200, 1500, 1400]
+    assert heights(0.15) == [1200, 1400, 1300]
+    assert heights(0.30) == [1200, 1400, 1300]
+    assert heights(0.304) == [1200, 1300, 1300]
+    with pytest.raises(ValidationError):
+        recommend_lance_profile(si_content_pct=0.2).endgame_action = ""
+    # steps is shared across callers too: no in-place edits
+    steps = recommend_lance_profile(si_content_pct=0.2).steps
+    with pytest.raises(AttributeError):
+        steps.append(steps[0])
+    with pytest.raises(TypeError):
+        steps[0] = steps[1]
+
+
 def test_predict_critical_temp_default_base() -> None:
     out = predict_critical_temp()
     assert out.t_critical_c == 1361.0
@@ -73,3 +138,37 @@ def test_diagnose_process_quality_no_findings() -> None:
     assert out.findings[0].severity == "low"
     assert "受控" in out.findings[0].title
 
+
+def test_diagnose_screen_covers_every_rule() -> None:
+    # _may_have_anomaly mirrors the rule thresholds by hand: any context that fires a rule must pass it.
+    # Values cluster around every threshold constant of the module so a loosened rule is caught.
+    rng = random.Random(20260115)
+    thresholds = [v for k, v in vars(dpq).items() if k.isupper() and isinstance(v, float)]
+
+    def value():
+        pick = rng.random()
+        if pick < 0.2:
+            return None
+        if pick < 0.5:
+            return rng.uniform(0.0, 1600.0)
+        return max(0.0, rng.choice(thresholds) + rng.choice((-1e-3, 0.0, 1e-3)))
+
+    for _ in range(5000):
+        slag = SlagAnalysis(V2O5=value(), TFe=value(), CaO=value())
+        process = ProcessData(
+            is_one_can=rng.choice((None, False, True)),
+            tap_time_min=value(),
+            lance_height_min=value(),
+            final_temp_c=value(),
+        )
+        iron = None
+        if rng.random() < 0.7:
+            si = rng.choice((rng.uniform(0.0, 0.6), dpq.SI_DILUTION_PCT + rng.choice((-1e-3, 0.0, 1e-3))))
+            ti = rng.uniform(0.0, 0.3)
+            v = min(5.0, (si + ti) * rng.uniform(0.8, 1.2))
+            iron = IronInitialAnalysis(C=4.0, Si=si, V=v, Ti=ti, P=0.08, S=0.03)
+
+        ctx = dpq._make_context(slag, process, iron)
+        fired = [rule.title for rule in dpq._RULES if rule.predicate(ctx)]
+        assert not fired or dpq._may_have_anomaly(ctx), fired
+
@@ -2,8 +2,10 @@ from app.tools.initial_charge import calculate_initial_charge
 from app.tools.kinetics_simulator import simulate_blow_path
 from app.schemas import InitialChargeInputs, IronInitialAnalysis, SimulationInputs
 
+_IRON_V6 = IronInitialAnalysis(C=4.2, Si=0.28, V=0.28, Ti=0.1, P=0.08, S=0.03)
+
 def test_initial_charge_v6():
-    iron_analysis = IronInitialAnalysis(C=4.2, Si=0.28, V=0.28, Ti=0.1, P=0.08, S=0.03)
+    iron_analysis = _IRON_V6
     inp = InitialChargeInputs(
         iron_weight_t=80.0,
         iron_temp_c=1340,
@@ -16,7 +18,7 @@ def test_initial_charge_v6():
     assert res.slag_weight_t > 0
 
 def test_kinetics_simulator_v6():
-    iron_analysis = IronInitialAnalysis(C=4.2, Si=0.28, V=0.28, Ti=0.1, P=0.08, S=0.03)
+    iron_analysis = _IRON_V6
     inp = SimulationInputs(
         initial_temp_c=1340,
         initial_analysis=iron_analysis,
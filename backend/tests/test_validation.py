@@ -2,6 +2,9 @@ import pytest
 from pydantic import ValidationError
 from app.schemas import IronInitialAnalysis, InitialChargeInputs, SimulationInputs
 
+# Valid baseline analysis shared by the input-model tests (never mutated)
+_ANALYSIS = IronInitialAnalysis(C=4.0, Si=0.2, V=0.3, Ti=0.1, P=0.05, S=0.02)
+
 def test_iron_analysis_validation():
     # Valid case
     valid = IronInitialAnalysis(C=4.2, Si=0.2, V=0.3, Ti=0.1, P=0.05, S=0.02)
@@ -16,13 +19,11 @@ def test_iron_analysis_validation():
         IronInitialAnalysis(C=12.0, Si=0.2, V=0.3, Ti=0.1, P=0.05, S=0.02)
 
 def test_initial_charge_inputs_validation():
-    analysis = IronInitialAnalysis(C=4.0, Si=0.2, V=0.3, Ti=0.1, P=0.05, S=0.02)
-    
     # Valid case
     valid = InitialChargeInputs(
         iron_weight_t=100.0,
         iron_temp_c=1350.0,
-        iron_analysis=analysis,
+        iron_analysis=_ANALYSIS,
         is_one_can=True,
         target_temp_c=1380.0
     )
@@ -33,7 +34,7 @@ def test_initial_charge_inputs_validation():
         InitialChargeInputs(
             iron_weight_t=10.0,
             iron_temp_c=1350.0,
-            iron_analysis=analysis,
+            iron_analysis=_ANALYSIS,
             is_one_can=True
         )
 
@@ -42,17 +43,15 @@ def test_initial_charge_inputs_validation():
         InitialChargeInputs(
             iron_weight_t=100.0,
             iron_temp_c=1700.0,
-            iron_analysis=analysis,
+            iron_analysis=_ANALYSIS,
             is_one_can=True
         )
 
 def test_simulation_inputs_validation():
-    analysis = IronInitialAnalysis(C=4.0, Si=0.2, V=0.3, Ti=0.1, P=0.05, S=0.02)
-    
     # Valid case
     valid = SimulationInputs(
         initial_temp_c=1350.0,
-        initial_analysis=analysis,
+        initial_analysis=_ANALYSIS,
         recipe={"ore": 1.0},
         oxygen_flow_rate_m3h=20000.0,
         duration_s=600
@@ -63,7 +62,7 @@ def test_simulation_inputs_validation():
     with pytest.raises(ValidationError):
         SimulationInputs(
             initial_temp_c=1350.0,
-            initial_analysis=analysis,
+            initial_analysis=_ANALYSIS,
             recipe={"ore": 1.0},
             duration_s=30
         )
@@ -1,20 +1,10 @@
-import os
-from pypdf import PdfReader
+import sys
 
-def check_pdf(file_path):
-    try:
-        reader = PdfReader(file_path)
-        print(f"Total pages: {len(reader.pages)}")
-        print("--- Page 1 Content ---")
-        print(reader.pages[0].extract_text())
-        print("--- Page 2 Content ---")
-        if len(reader.pages) > 1:
-            print(reader.pages[1].extract_text())
-    except Exception as e:
-        print(f"Error: {e}")
+import pdf_dump
+
+# Kept for existing callers; the implementation lives in pdf_dump.py
+def check_pdf(file_path, fast=False):
+    pdf_dump.main([file_path, "--pages", "0,1"] + (["--fast-extract"] if fast else []))
 
 if __name__ == "__main__":
-    target_pdf = "5.达涅利SDM自动炼钢模型四大平衡计算(2)_20260130152512.pdf"
-    base_path = "/Users/wenqing/Desktop/VAgent"
-    full_path = os.path.join(base_path, target_pdf)
-    check_pdf(full_path)
+    pdf_dump.main(["--pages", "0,1", *sys.argv[1:]])
@@ -0,0 +1,185 @@
+"""
+Dump the text of selected PDF pages to stdout (PyMuPDF).
+
+    python pdf_dump.py [PDF] --pages 0,1
+    python pdf_dump.py [PDF] --range 2:15 [--force-refresh] [--fast-extract] [-o OUT.txt]
+
+--pages and --range can be combined in one run; the document is opened once.
+Page indices are 0-based; --range A:B is half-open like range(A, B).
+"""
+import argparse
+import hashlib
+import io
+import mmap
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(os.getcwd() + "/backend")
+
+from app.core.pdf_io import clear_cache, open_cached, page_text
+
+DEFAULT_PDF = os.path.join(
+    "/Users/wenqing/Desktop/VAgent",
+    "5.达涅利SDM自动炼钢模型四大平衡计算(2)_20260130152512.pdf",
+)
+
+# 提取结果按 PDF 内容指纹 + 页码选择缓存，重复运行只读缓存文件
+CACHE_DIR = Path.home() / ".vagent_cache" / "pdf"
+
+def _cache_path(file_path, label, fast):
+    with open(file_path, "rb") as f:
+        digest = hashlib.md5(f.read()).hexdigest()
+    # Fast extraction produces different text, so it gets its own entry
+    suffix = "_fast" if fast else ""
+    return CACHE_DIR / f"{digest}_{label}{suffix}.txt"
+
+def _write_cache(cache_path, src):
+    # Copy src (binary file object) to a temp file in the same directory, then rename:
+    # readers never see a partial cache
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("wb", dir=cache_path.parent, delete=False) as tmp:
+        shutil.copyfileobj(src, tmp)
+    os.replace(tmp.name, cache_path)
+
+# Initial per-page size estimate for -o; the mapping grows if the text is larger
+_PAGE_BYTES_ESTIMATE = 64 * 1024
+
+class _MmapSink:
+    """Writes by offset into an mmap of the output file; truncated to the written size on close."""
+
+    def __init__(self, path, expected_size):
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        self._map = None
+        self._offset = 0
+        self._remap(max(expected_size, mmap.PAGESIZE))
+
+    def _remap(self, size):
+        # mmap.resize() needs mremap (not on macOS): unmap, grow the file, map again
+        if self._map is not None:
+            self._map.close()
+        os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        self._size = size
+
+    def write(self, data):
+        end = self._offset + len(data)
+        if end > self._size:
+            self._remap(max(end, self._size * 2))
+        self._map[self._offset:end] = data
+        self._offset = end
+
+    def close(self):
+        if self._fd is None:
+            return
+        self._map.close()
+        os.ftruncate(self._fd, self._offset)
+        os.close(self._fd)
+        self._fd = None
+
+def _extract_one(args):
+    # Module-level so Pool can pickle it; each worker keeps its own cached handle
+    path, i, fast = args
+    return i, page_text(open_cached(path), i, fast)
+
+def _extract_pages(file_path, pages, fast):
+    # Yields (i, text) in page order as soon as each page is ready, so the
+    # caller prints page k while the workers are still extracting later pages
+    if len(pages) <= 1:
+        yield from (_extract_one((file_path, i, fast)) for i in pages)
+        return
+    # fork avoids re-importing this module in every worker (unavailable on Windows)
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+    ctx = multiprocessing.get_context(method)
+    with ctx.Pool(min(len(pages), os.cpu_count() or 1), initializer=clear_cache) as pool:
+        yield from pool.imap(_extract_one, [(file_path, i, fast) for i in pages])
+
+def _chunks(file_path, pages, total_pages, fast):
+    yield f"Total pages: {total_pages}\n".encode("utf-8")
+    for i, text in _extract_pages(file_path, pages, fast):
+        yield f"--- Page {i+1} Content ---\n{text}\n".encode("utf-8", "replace")
+
+def dump_pages(file_path, pages, label, force_refresh=False, fast=False, output=None):
+    """
+    Print "Total pages" and each requested page that exists; label keys the cache.
+    With output, the same bytes go to that file (through an mmap) instead of stdout.
+    """
+    # Write UTF-8 straight to the byte stream (skips the per-print TextIOWrapper
+    # encode/flush); flush pending print() output first to keep ordering
+    sys.stdout.flush()
+    stdout = sys.stdout.buffer
+    sink = None
+    try:
+        cache_path = _cache_path(file_path, label, fast)
+        if not force_refresh and cache_path.exists():
+            data = cache_path.read_bytes()
+            if output:
+                sink = _MmapSink(output, len(data))
+            (sink or stdout).write(data)
+            return
+
+        total_pages = open_cached(file_path).page_count
+
+        # Pages are independent: extract them across processes, print in page order
+        pages = [i for i in pages if 0 <= i < total_pages]
+
+        if output:
+            sink = _MmapSink(output, len(pages) * _PAGE_BYTES_ESTIMATE)
+        out = sink or stdout
+        # On stdout, keep the written bytes as the cache payload; a file output is copied instead
+        buf = None if sink else io.BytesIO()
+        for data in _chunks(file_path, pages, total_pages, fast):
+            out.write(data)
+            if buf is not None:
+                buf.write(data)
+
+        if sink:
+            sink.close()
+            with open(output, "rb") as src:
+                _write_cache(cache_path, src)
+        else:
+            buf.seek(0)
+            _write_cache(cache_path, buf)
+
+    except Exception as e:
+        stdout.write(f"Error: {e}\n".encode("utf-8", "replace"))
+    finally:
+        if sink:
+            sink.close()
+        stdout.flush()
+
+def _page_list(value):
+    return [int(p) for p in value.split(",") if p.strip()]
+
+def _page_range(value):
+    start, _, end = value.partition(":")
+    return int(start), int(end)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dump PDF page text to stdout.")
+    parser.add_argument("pdf", nargs="?", default=DEFAULT_PDF)
+    parser.add_argument("--pages", type=_page_list, help="comma-separated 0-based page indices, e.g. 0,1")
+    parser.add_argument("--range", type=_page_range, dest="page_range", help="half-open page range A:B, e.g. 2:15")
+    parser.add_argument("--force-refresh", action="store_true", help="ignore the cached output")
+    parser.add_argument("--fast-extract", action="store_true", help="minimal get_text flags, unsorted")
+    parser.add_argument("-o", "--output", help="write to this file (mmap-backed) instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.pages is None and args.page_range is None:
+        parser.error("one of --pages or --range is required")
+
+    pages, labels = [], []
+    if args.pages is not None:
+        pages += args.pages
+        labels.append("p" + "-".join(map(str, args.pages)))
+    if args.page_range is not None:
+        start, end = args.page_range
+        pages += range(start, end)
+        labels.append(f"{start}_{end}")
+
+    dump_pages(args.pdf, pages, "_".join(labels), args.force_refresh, args.fast_extract, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 import sys
 import os
+import numpy as np
 sys.path.append(os.getcwd() + "/backend")
 
-from app.tools.kinetics_simulator import simulate_blow_path
+from app.tools.kinetics_simulator import simulate_blow_path_array
 from app.schemas import SimulationInputs, IronInitialAnalysis
 
 def test_kinetics():
@@ -21,7 +22,7 @@ def test_kinetics():
         oxygen_flow_rate_m3h=24000.0,
         duration_s=600 # 10 min
     )
-    result = simulate_blow_path(inputs)
+    result, arr = simulate_blow_path_array(inputs)
     
     print(f"Final Temp: {result.final_temp_c} C")
     print(f"Tc Crossover: {result.tc_crossover_s} s")
@@ -29,8 +30,8 @@ def test_kinetics():
     
     print("\nTime | Temp | C%   | Si%  | V%   | Ti%")
     print("-" * 40)
-    for p in result.points[::6]: # Print every 60s
-        print(f"{p.time_s:4d} | {p.temp_c:4.0f} | {p.C_pct:4.2f} | {p.Si_pct:4.2f} | {p.V_pct:4.2f} | {p.Ti_pct:4.2f}")
+    cols = arr[["time_s", "temp_c", "C_pct", "Si_pct", "V_pct", "Ti_pct"]][::6] # Print every 60s
+    np.savetxt(sys.stdout, cols, fmt=["%4d", "%4.0f", "%4.2f", "%4.2f", "%4.2f", "%4.2f"], delimiter=" | ")
 
 if __name__ == "__main__":
     test_kinetics()